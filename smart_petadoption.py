@@ -3,14 +3,38 @@
 Smart Pet Adoption Shelter - Complete Fixed Version
 """
 
+import os
 import sys
+import queue
+import atexit
+import collections
+import concurrent.futures
+import functools
+import gzip
 import sqlite3
 import hashlib
+import hmac
+import itertools
+import re
 import json
+import mimetypes
+import threading
+import types
 import urllib.parse
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
 
+# Optional fast JSON codec (falls back to the stdlib json module)
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
+
 # Fix Windows Unicode encoding issues
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -18,11 +42,89 @@ if sys.platform == 'win32':
 # Database setup
 DB_NAME = 'pets.db'
 
+# Per-connection SQLite settings - unlike journal_mode these are not stored in
+# the database file, so every connection has to apply them itself
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-20000',
+)
+
+# Locally cached pet photos, served under /static/ with long-lived cache headers
+STATIC_DIR = 'static'
+PET_PHOTO_DIR = os.path.join(STATIC_DIR, 'pets')
+
+# Handler SQL, bound once so every execution hits the connection's statement cache
+SQL_GET_USERS = 'SELECT id, username, email, password_hash, user_type FROM users'
+SQL_UPDATE_PASSWORD = 'UPDATE users SET password_hash = ? WHERE id = ?'
+SQL_REGISTER = "INSERT INTO users (username, email, password_hash, user_type) VALUES (?, ?, ?, 'adopter') RETURNING id, username, email, user_type"
+SQL_GET_PETS = 'SELECT id, name, species, breed, color, age_months, gender, vaccinated, activity_level, weight_kg, description, profile_photo_url FROM animals'
+SQL_SET_PHOTO_URL = 'UPDATE animals SET profile_photo_url = ? WHERE id = ?'
+SQL_GET_PET_TRAITS = 'SELECT species, activity_level, age_months FROM animals WHERE id = ?'
+SQL_ADD_PET = ('INSERT INTO animals (name, species, breed, color, age_months, gender, vaccinated, activity_level, weight_kg, description, profile_photo_url) '
+               'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+SQL_GET_REQUESTS = 'SELECT id, adopter_name, pet_name, applied_at, status FROM adoption_applications ORDER BY applied_at DESC'
+SQL_ADOPT_PET = ('INSERT INTO adoption_applications (adopter_id, animal_id, adopter_name, pet_name) VALUES (?, ?, ?, ?) '
+                 'RETURNING id, adopter_name, pet_name, applied_at, status')
+
+# Precomputed legacy digests for the bootstrap accounts (upgraded to scrypt on first login)
+ADMIN_PASSWORD_HASH = '240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9'    # sha256('admin123')
+ADOPTER_PASSWORD_HASH = 'e606e38b0d8c19b24cf0ee3808183162ea7cd63ff7912dbb22b5e803286b4446'  # sha256('user123')
+
+# Sample pets seeded into an empty database - 7 Dogs and 5 Cats
+SAMPLE_PETS = (
+    # 7 Dogs of different breeds
+    ('Max', 'Dog', 'Golden Retriever', 'Golden', 24, 'Male', 1, 'High', 30.5, 
+     'Friendly and energetic golden retriever who loves to play fetch!', 
+     'https://images.unsplash.com/photo-1633722715463-d30f4f325e24?w=400'),
+    ('Charlie', 'Dog', 'Labrador', 'Black', 36, 'Male', 1, 'High', 32.0, 
+     'Loyal and intelligent lab, great with families and children.', 
+     'https://images.unsplash.com/photo-1587300003388-59208cc962cb?w=400'),
+    ('Rocky', 'Dog', 'German Shepherd', 'Brown', 48, 'Male', 1, 'High', 38.5, 
+     'Protective and loyal German Shepherd, needs experienced owner.', 
+     'https://images.unsplash.com/photo-1568572933382-74d440642117?w=400'),
+    ('Daisy', 'Dog', 'Beagle', 'Tricolor', 15, 'Female', 1, 'Medium', 12.0, 
+     'Sweet beagle puppy with lots of energy and curiosity.', 
+     'https://images.unsplash.com/photo-1505628346881-b72b27e84530?w=400'),
+    ('Buddy', 'Dog', 'Poodle', 'White', 20, 'Male', 1, 'Medium', 15.0, 
+     'Smart and hypoallergenic poodle, perfect for families with allergies.', 
+     'https://images.unsplash.com/photo-1616940844649-535215ae4eb1?w=400'),
+    ('Duke', 'Dog', 'Bulldog', 'Brindle', 28, 'Male', 1, 'Low', 25.0, 
+     'Laid-back bulldog with a sweet temperament, great for apartments.', 
+     'https://images.unsplash.com/photo-1583511655857-d19b40a7a54e?w=400'),
+    ('Cooper', 'Dog', 'Husky', 'Gray & White', 30, 'Male', 1, 'High', 28.0, 
+     'Energetic Siberian Husky with striking blue eyes, loves cold weather and running.', 
+     'https://images.unsplash.com/photo-1605568427561-40dd23c2acea?w=400'),
+
+    # 5 Cats of different breeds
+    ('Luna', 'Cat', 'Siamese', 'Cream', 18, 'Female', 1, 'Medium', 4.2, 
+     'Elegant Siamese cat with beautiful blue eyes and a gentle personality.', 
+     'https://images.unsplash.com/photo-1513360371669-4adf3dd7dff8?w=400'),
+    ('Bella', 'Cat', 'Persian', 'White', 12, 'Female', 1, 'Low', 3.8, 
+     'Calm and affectionate Persian cat, perfect for quiet homes.', 
+     'https://images.unsplash.com/photo-1595433707802-6b2626ef1c91?w=400'),
+    ('Whiskers', 'Cat', 'Maine Coon', 'Orange', 30, 'Male', 1, 'Medium', 6.5, 
+     'Large and fluffy Maine Coon with a playful personality.', 
+     'https://images.unsplash.com/photo-1574158622682-e40e69881006?w=400'),
+    ('Shadow', 'Cat', 'British Shorthair', 'Gray', 24, 'Male', 1, 'Low', 5.5, 
+     'Calm and independent British Shorthair, great for apartments.', 
+     'https://images.unsplash.com/photo-1596854407944-bf87f6fdd49e?w=400'),
+    ('Cleo', 'Cat', 'Bengal', 'Spotted', 14, 'Female', 1, 'High', 4.5, 
+     'Active and playful Bengal cat with beautiful spotted coat.', 
+     'https://images.unsplash.com/photo-1606214174585-fe31582dc6ee?w=400')
+)
+
 def init_database():
     """Initialize SQLite database with required tables and sample data"""
     conn = sqlite3.connect(DB_NAME)
     cursor = conn.cursor()
     
+    # Journal/durability settings (WAL is persistent, later connections inherit it)
+    cursor.execute('PRAGMA journal_mode=WAL')
+    for pragma in CONNECTION_PRAGMAS:
+        cursor.execute(pragma)
+    
     # Create users table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS users (
@@ -69,170 +171,400 @@ def init_database():
         )
     ''')
     
+    # Indexes for the requests listing sort and common pet filters
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_apps_applied_at ON adoption_applications(applied_at DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_animals_species_activity ON animals(species, activity_level)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_animals_species_age ON animals(species, age_months)')
+    
     # Insert default admin user
-    admin_password = hashlib.sha256('admin123'.encode()).hexdigest()
     cursor.execute('''
         INSERT OR IGNORE INTO users (username, email, password_hash, user_type)
         VALUES (?, ?, ?, ?)
-    ''', ('admin', 'admin@shelter.com', admin_password, 'admin'))
+    ''', ('admin', 'admin@shelter.com', ADMIN_PASSWORD_HASH, 'admin'))
     
     # Insert sample adopter user
-    adopter_password = hashlib.sha256('user123'.encode()).hexdigest()
     cursor.execute('''
         INSERT OR IGNORE INTO users (username, email, password_hash, user_type)
         VALUES (?, ?, ?, ?)
-    ''', ('user', 'user@example.com', adopter_password, 'adopter'))
+    ''', ('user', 'user@example.com', ADOPTER_PASSWORD_HASH, 'adopter'))
     
     # Check if animals already exist
-    cursor.execute('SELECT COUNT(*) FROM animals')
-    if cursor.fetchone()[0] == 0:
-        # Insert sample pets - 7 Dogs and 5 Cats
-        sample_pets = [
-            # 7 Dogs of different breeds
-            ('Max', 'Dog', 'Golden Retriever', 'Golden', 24, 'Male', 1, 'High', 30.5, 
-             'Friendly and energetic golden retriever who loves to play fetch!', 
-             'https://images.unsplash.com/photo-1633722715463-d30f4f325e24?w=400'),
-            ('Charlie', 'Dog', 'Labrador', 'Black', 36, 'Male', 1, 'High', 32.0, 
-             'Loyal and intelligent lab, great with families and children.', 
-             'https://images.unsplash.com/photo-1587300003388-59208cc962cb?w=400'),
-            ('Rocky', 'Dog', 'German Shepherd', 'Brown', 48, 'Male', 1, 'High', 38.5, 
-             'Protective and loyal German Shepherd, needs experienced owner.', 
-             'https://images.unsplash.com/photo-1568572933382-74d440642117?w=400'),
-            ('Daisy', 'Dog', 'Beagle', 'Tricolor', 15, 'Female', 1, 'Medium', 12.0, 
-             'Sweet beagle puppy with lots of energy and curiosity.', 
-             'https://images.unsplash.com/photo-1505628346881-b72b27e84530?w=400'),
-            ('Buddy', 'Dog', 'Poodle', 'White', 20, 'Male', 1, 'Medium', 15.0, 
-             'Smart and hypoallergenic poodle, perfect for families with allergies.', 
-             'https://images.unsplash.com/photo-1616940844649-535215ae4eb1?w=400'),
-            ('Duke', 'Dog', 'Bulldog', 'Brindle', 28, 'Male', 1, 'Low', 25.0, 
-             'Laid-back bulldog with a sweet temperament, great for apartments.', 
-             'https://images.unsplash.com/photo-1583511655857-d19b40a7a54e?w=400'),
-            ('Cooper', 'Dog', 'Husky', 'Gray & White', 30, 'Male', 1, 'High', 28.0, 
-             'Energetic Siberian Husky with striking blue eyes, loves cold weather and running.', 
-             'https://images.unsplash.com/photo-1605568427561-40dd23c2acea?w=400'),
-            
-            # 5 Cats of different breeds
-            ('Luna', 'Cat', 'Siamese', 'Cream', 18, 'Female', 1, 'Medium', 4.2, 
-             'Elegant Siamese cat with beautiful blue eyes and a gentle personality.', 
-             'https://images.unsplash.com/photo-1513360371669-4adf3dd7dff8?w=400'),
-            ('Bella', 'Cat', 'Persian', 'White', 12, 'Female', 1, 'Low', 3.8, 
-             'Calm and affectionate Persian cat, perfect for quiet homes.', 
-             'https://images.unsplash.com/photo-1595433707802-6b2626ef1c91?w=400'),
-            ('Whiskers', 'Cat', 'Maine Coon', 'Orange', 30, 'Male', 1, 'Medium', 6.5, 
-             'Large and fluffy Maine Coon with a playful personality.', 
-             'https://images.unsplash.com/photo-1574158622682-e40e69881006?w=400'),
-            ('Shadow', 'Cat', 'British Shorthair', 'Gray', 24, 'Male', 1, 'Low', 5.5, 
-             'Calm and independent British Shorthair, great for apartments.', 
-             'https://images.unsplash.com/photo-1596854407944-bf87f6fdd49e?w=400'),
-            ('Cleo', 'Cat', 'Bengal', 'Spotted', 14, 'Female', 1, 'High', 4.5, 
-             'Active and playful Bengal cat with beautiful spotted coat.', 
-             'https://images.unsplash.com/photo-1606214174585-fe31582dc6ee?w=400')
-        ]
-        
+    cursor.execute('SELECT 1 FROM animals LIMIT 1')
+    if cursor.fetchone() is None:
+        # Seed all sample pets in one explicit transaction (single fsync)
+        conn.commit()
+        cursor.execute('BEGIN IMMEDIATE')
         cursor.executemany('''
             INSERT INTO animals (name, species, breed, color, age_months, gender, 
                                vaccinated, activity_level, weight_kg, description, profile_photo_url)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', sample_pets)
+        ''', SAMPLE_PETS)
+        conn.commit()
     
     conn.commit()
     conn.close()
     print("✅ Database initialized successfully!")
 
+# Connection pool - handler threads borrow a connection per request and hand it back,
+# so connections (and their PRAGMAs/statement cache) outlive the per-socket threads
+POOL_SIZE = 16
+_idle_conns = queue.LifoQueue(maxsize=POOL_SIZE)
+_open_conns = set()  # every connection the pool has opened, so exit can close them all
+_open_conns_lock = threading.Lock()
+_pool = threading.local()
+
+def get_conn():
+    """Return this thread's SQLite connection, borrowing an idle one or opening it on first use"""
+    conn = getattr(_pool, 'conn', None)
+    if conn is None:
+        try:
+            _pool.conn = _idle_conns.get_nowait()
+            return _pool.conn
+        except queue.Empty:
+            pass
+        conn = sqlite3.connect(DB_NAME, check_same_thread=False, isolation_level=None, cached_statements=256)
+        conn.execute('PRAGMA journal_mode=WAL')
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        conn.row_factory = sqlite3.Row
+        with _open_conns_lock:
+            _open_conns.add(conn)
+        _pool.conn = conn
+    return conn
+
+def _close(conn):
+    with _open_conns_lock:
+        _open_conns.discard(conn)
+    conn.close()
+
+def close_pool():
+    """Close every pooled connection - idle, borrowed or the writer's - so the final WAL checkpoint runs"""
+    _pool.conn = None
+    with _open_conns_lock:
+        conns = list(_open_conns)
+        _open_conns.clear()
+    for conn in conns:
+        conn.close()
+
+def release_conn():
+    """Return this thread's connection to the idle pool (closed if the pool is full)"""
+    conn = getattr(_pool, 'conn', None)
+    if conn is None:
+        return
+    _pool.conn = None
+    if conn.in_transaction:
+        conn.execute('ROLLBACK')
+    try:
+        _idle_conns.put_nowait(conn)
+    except queue.Full:
+        _close(conn)
+
+atexit.register(close_pool)
+
+def with_db(fn):
+    """Pass the pooled connection to a handler and report any failure as an API error"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(get_conn(), *args, **kwargs)
+        except Exception as e:
+            return {'success': False, 'message': str(e)}
+    return wrapper
+
+def cache_pet_photos():
+    """Download remote pet photos once into PET_PHOTO_DIR and point the rows at the local copy"""
+    os.makedirs(PET_PHOTO_DIR, exist_ok=True)
+    conn = get_conn()
+    cached = 0
+    for pet_id, url in conn.execute('SELECT id, profile_photo_url FROM animals').fetchall():
+        if not url or not url.startswith(('http://', 'https://')):
+            continue
+        parts = urllib.parse.urlsplit(url)
+        if parts.netloc == 'images.unsplash.com':
+            # Let Unsplash's image CDN re-encode to AVIF (smaller than the default JPEG)
+            query = urllib.parse.urlencode(dict(urllib.parse.parse_qsl(parts.query), fm='avif'))
+            url = urllib.parse.urlunsplit(parts._replace(query=query))
+        try:
+            with urllib.request.urlopen(url, timeout=10) as resp:
+                content_type = resp.headers.get_content_type()
+                body = resp.read()
+        except OSError as e:
+            print(f"⚠️ Could not cache photo for pet {pet_id}: {e}")
+            continue
+        filename = f"{pet_id}{mimetypes.guess_extension(content_type) or '.img'}"
+        with open(os.path.join(PET_PHOTO_DIR, filename), 'wb') as f:
+            f.write(body)
+        conn.execute(SQL_SET_PHOTO_URL, (f'/static/pets/{filename}', pet_id))
+        cached += 1
+    _invalidate_pets_cache()
+    print(f"✅ Cached {cached} pet photos locally!")
+
+# Password hashing - memoized per process, digests never leave memory
+# (hashlib.sha256 is OpenSSL-backed and uses the CPU's SHA extensions when present)
+_SHA256 = hashlib.sha256
+
+# Salted scrypt cost parameters, stored with every hash as scrypt$N$r$p$salt$hash
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1
+
+@functools.lru_cache(maxsize=1024)
+def _pw_hash(password):
+    """SHA-256 pre-hash; bounds the scrypt input and doubles as the legacy digest"""
+    return _SHA256(password.encode('utf-8', 'strict')).digest().hex()
+
+def hash_password(password):
+    """Build a salted scrypt verifier string for storage"""
+    salt = os.urandom(16)
+    key = hashlib.scrypt(_pw_hash(password).encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=32)
+    return f'scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${key.hex()}'
+
+@functools.lru_cache(maxsize=256)
+def _verify_password(password_hash, prehash):
+    """Check a pre-hashed password against a stored hash, skipping the KDF on repeat logins"""
+    if not password_hash.startswith('scrypt$'):
+        # Legacy unsalted SHA-256 digest
+        return hmac.compare_digest(password_hash, prehash)
+    _, n, r, p, salt, key = password_hash.split('$')
+    derived = hashlib.scrypt(prehash.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p), dklen=len(key) // 2)
+    return hmac.compare_digest(derived.hex(), key)
+
 # API Handler Functions
-def handle_login(data):
+# In-memory auth table: username -> (id, email, password_hash, user_type)
+_USERS = None
+_USERS_LOCK = threading.Lock()
+
+def _get_users():
+    """Return the auth table, loading it from the database on first use"""
+    global _USERS
+    with _USERS_LOCK:
+        if _USERS is None:
+            _USERS = {row[1]: (row[0], row[2], row[3], row[4]) for row in get_conn().execute(SQL_GET_USERS)}
+        return _USERS
+
+@with_db
+def handle_login(conn, data):
     username = data.get('username')
     password = data.get('password')
     user_type = data.get('user_type')
-    password_hash = hashlib.sha256(password.encode()).hexdigest()
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT id, username, email, user_type FROM users WHERE username = ? AND password_hash = ? AND user_type = ?', 
-                   (username, password_hash, user_type))
-    user = cursor.fetchone()
-    conn.close()
-    if user:
-        return {'success': True, 'user': {'id': user[0], 'username': user[1], 'email': user[2], 'user_type': user[3]}}
+    users = _get_users()
+    user = users.get(username)
+    if user and user[3] == user_type and _verify_password(user[2], _pw_hash(password)):
+        if not user[2].startswith('scrypt$'):
+            password_hash = hash_password(password)
+            conn.execute(SQL_UPDATE_PASSWORD, (password_hash, user[0]))
+            with _USERS_LOCK:
+                users[username] = (user[0], user[1], password_hash, user[3])
+        return {'success': True, 'user': {'id': user[0], 'username': username, 'email': user[1], 'user_type': user[3]}}
     return {'success': False, 'message': 'Invalid credentials'}
 
-def handle_register(data):
+@with_db
+def handle_register(conn, data):
     username = data.get('username')
     email = data.get('email')
     password = data.get('password')
-    password_hash = hashlib.sha256(password.encode()).hexdigest()
+    password_hash = hash_password(password)
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO users (username, email, password_hash, user_type) VALUES (?, ?, ?, 'adopter')", 
-                       (username, email, password_hash))
-        conn.commit()
-        conn.close()
-        return {'success': True}
+        user = conn.execute(SQL_REGISTER, (username, email, password_hash)).fetchone()
     except sqlite3.IntegrityError:
         return {'success': False, 'message': 'Username or email already exists'}
+    users = _get_users()
+    with _USERS_LOCK:
+        users[user[1]] = (user[0], user[2], password_hash, user[3])
+    return {'success': True, 'user': {'id': user[0], 'username': user[1], 'email': user[2], 'user_type': user[3]}}
 
-def handle_get_pets():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT id, name, species, breed, color, age_months, gender, vaccinated, activity_level, weight_kg, description, profile_photo_url FROM animals')
-    pets = []
-    for row in cursor.fetchall():
-        pets.append({'id': row[0], 'name': row[1], 'species': row[2], 'breed': row[3], 'color': row[4], 
-                    'age_months': row[5], 'gender': row[6], 'vaccinated': bool(row[7]), 'activity_level': row[8], 
-                    'weight_kg': row[9], 'description': row[10], 'profile_photo_url': row[11]})
-    conn.close()
-    return {'success': True, 'pets': pets}
+# Read-mostly pet catalog snapshot and its encoded /api/pets payload + ETag,
+# all rebuilt lazily after the catalog changes
+_PETS_CACHE = None
+_PETS_JSON_CACHE = None
+_PETS_ETAG = None
+_PETS_LOCK = threading.Lock()
+
+def _etag(payload):
+    return '"%s"' % hashlib.md5(payload, usedforsecurity=False).hexdigest()
+
+def _like_escape(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
 
-def handle_add_pet(data):
+_LEADING_INT = re.compile(r'\s*[+-]?\d+')
+
+def _age_filter(value):
+    """Read an age like JS parseInt ('1.5' -> 1); values with no leading digits drop the filter"""
+    match = _LEADING_INT.match(value)
+    return int(match.group()) if match else None
+
+# /api/pets query filters -> (WHERE fragment, value converter returning None to skip)
+PET_FILTERS = {
+    'species': ('species = ?', str),
+    'breed': ("breed LIKE ? ESCAPE '\\'", lambda v: '%' + _like_escape(v) + '%'),
+    'color': ("color LIKE ? ESCAPE '\\'", lambda v: '%' + _like_escape(v) + '%'),
+    'min_age': ('age_months >= ?', _age_filter),
+    'max_age': ('age_months <= ?', _age_filter),
+    'gender': ('gender = ?', str),
+    'vaccinated': ('vaccinated = ?', int),
+    'activity_level': ('activity_level = ?', str),
+}
+
+def _pet_dict(row):
+    # Keys follow SQL_GET_PETS' column order; only the vaccinated flag needs converting
+    pet = dict(row)
+    pet['vaccinated'] = bool(pet['vaccinated'])
+    return pet
+
+def _load_pets():
+    """Return the cached list of pet dicts; caller must hold _PETS_LOCK"""
+    global _PETS_CACHE
+    if _PETS_CACHE is None:
+        _PETS_CACHE = [_pet_dict(row) for row in get_conn().execute(SQL_GET_PETS)]
+    return _PETS_CACHE
+
+def _invalidate_pets_cache():
+    global _PETS_CACHE, _PETS_JSON_CACHE, _PETS_ETAG
+    with _PETS_LOCK:
+        _PETS_CACHE = None
+        _PETS_JSON_CACHE = None
+        _PETS_ETAG = None
+    _get_pet_traits.cache_clear()
+    _compat_result.cache_clear()
+
+def get_pets():
+    """Return the pet catalog as a list of dicts (shared - do not mutate)"""
+    with _PETS_LOCK:
+        return _load_pets()
+
+def handle_get_pets(filters=None, limit=None, offset=0):
+    """Return pets as (encoded JSON bytes, ETag); only the unfiltered catalog is cached and tagged"""
+    global _PETS_JSON_CACHE, _PETS_ETAG
+    if filters or limit is not None or offset:
+        return _dumps(_query_pets(filters or {}, limit, offset)), None
+    with _PETS_LOCK:
+        if _PETS_JSON_CACHE is None:
+            _PETS_JSON_CACHE = _dumps({'success': True, 'pets': _load_pets()})
+            _PETS_ETAG = _etag(_PETS_JSON_CACHE)
+        return _PETS_JSON_CACHE, _PETS_ETAG
+
+@with_db
+def _query_pets(conn, filters, limit, offset):
+    clauses, params = [], []
+    for name, value in filters.items():
+        if name in PET_FILTERS and value != '':
+            clause, convert = PET_FILTERS[name]
+            value = convert(value)
+            if value is None:
+                continue
+            clauses.append(clause)
+            params.append(value)
+    sql = SQL_GET_PETS
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    sql += ' ORDER BY id LIMIT ? OFFSET ?'
+    params += [-1 if limit is None else int(limit), int(offset)]
+    return {'success': True, 'pets': [_pet_dict(row) for row in conn.execute(sql, params)]}
+
+@with_db
+def handle_add_pet(conn, data):
+    conn.execute(SQL_ADD_PET,
+                 (data['name'], data['species'], data['breed'], data['color'], int(data['age_months']), data['gender'], 
+                  int(data['vaccinated']), data['activity_level'], float(data['weight_kg']), data['description'], data['profile_photo_url']))
+    _invalidate_pets_cache()
+    return {'success': True}
+
+@with_db
+def handle_get_requests(conn):
+    requests = [{'id': row[0], 'adopter_name': row[1], 'pet_name': row[2], 'applied_at': row[3], 'status': row[4]}
+                for row in conn.execute(SQL_GET_REQUESTS)]
+    return {'success': True, 'requests': requests}
+
+# Encoded GET /api/requests payload + ETag, cleared whenever an adoption commits
+_REQUESTS_JSON_CACHE = None
+_REQUESTS_ETAG = None
+_REQUESTS_LOCK = threading.Lock()
+
+def _invalidate_requests_cache():
+    global _REQUESTS_JSON_CACHE, _REQUESTS_ETAG
+    with _REQUESTS_LOCK:
+        _REQUESTS_JSON_CACHE = None
+        _REQUESTS_ETAG = None
+
+def get_requests_payload():
+    """Return the adoption requests as (encoded JSON bytes, ETag)"""
+    global _REQUESTS_JSON_CACHE, _REQUESTS_ETAG
+    with _REQUESTS_LOCK:
+        if _REQUESTS_JSON_CACHE is None:
+            response = handle_get_requests()
+            if not response['success']:
+                return _dumps(response), None  # errors are never cached or tagged
+            _REQUESTS_JSON_CACHE = _dumps(response)
+            _REQUESTS_ETAG = _etag(_REQUESTS_JSON_CACHE)
+        return _REQUESTS_JSON_CACHE, _REQUESTS_ETAG
+
+# Adoption writer - queued applications are committed in batches by one thread
+_adopt_queue = collections.deque()
+_adopt_cv = threading.Condition()
+_adopt_writer = None
+
+ADOPT_TIMEOUT = 30  # seconds a request waits for the writer before giving up
+
+def _adopt_writer_loop():
+    conn = get_conn()
+    while True:
+        with _adopt_cv:
+            if not _adopt_queue:
+                _adopt_cv.wait(timeout=0.1)
+            batch = list(_adopt_queue)
+            _adopt_queue.clear()
+        if batch:
+            _write_adoptions(conn, batch)
+
+def _write_adoptions(conn, batch):
+    """Insert one batch in a single transaction; every future is resolved once it has committed"""
+    results = []
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute('''INSERT INTO animals (name, species, breed, color, age_months, gender, vaccinated, activity_level, weight_kg, description, profile_photo_url)
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                      (data['name'], data['species'], data['breed'], data['color'], int(data['age_months']), data['gender'], 
-                       int(data['vaccinated']), data['activity_level'], float(data['weight_kg']), data['description'], data['profile_photo_url']))
-        conn.commit()
-        conn.close()
-        return {'success': True}
+        conn.execute('BEGIN IMMEDIATE')
+        for params, future in batch:
+            try:
+                results.append((future, conn.execute(SQL_ADOPT_PET, params).fetchone(), None))
+            except Exception as e:
+                results.append((future, None, e))
+        conn.execute('COMMIT')
+        _invalidate_requests_cache()
     except Exception as e:
-        return {'success': False, 'message': str(e)}
+        results = [(future, None, e) for _, future in batch]
+    finally:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        resolved = set()
+        for future, row, error in results:
+            resolved.add(future)
+            if error is None:
+                future.set_result(row)
+            else:
+                future.set_exception(error)
+        for _, future in batch:
+            if future not in resolved:
+                future.set_exception(RuntimeError('Adoption was not written'))
 
-def handle_get_requests():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT id, adopter_name, pet_name, applied_at, status FROM adoption_applications ORDER BY applied_at DESC')
-    requests = []
-    for row in cursor.fetchall():
-        requests.append({'id': row[0], 'adopter_name': row[1], 'pet_name': row[2], 'applied_at': row[3], 'status': row[4]})
-    conn.close()
-    return {'success': True, 'requests': requests}
+def _queue_adoption(params):
+    """Hand an application to the writer thread; the future resolves to the inserted row"""
+    global _adopt_writer
+    future = concurrent.futures.Future()
+    with _adopt_cv:
+        if _adopt_writer is None or not _adopt_writer.is_alive():
+            _adopt_writer = threading.Thread(target=_adopt_writer_loop, name='adopt-writer', daemon=True)
+            _adopt_writer.start()
+        _adopt_queue.append((params, future))
+        _adopt_cv.notify()
+    return future
 
 def handle_adopt_pet(data):
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute('INSERT INTO adoption_applications (adopter_id, animal_id, adopter_name, pet_name) VALUES (?, ?, ?, ?)',
-                      (data['adopter_id'], data['animal_id'], data['adopter_name'], data['pet_name']))
-        conn.commit()
-        conn.close()
-        return {'success': True}
+        row = _queue_adoption((data['adopter_id'], data['animal_id'], data['adopter_name'], data['pet_name'])).result(ADOPT_TIMEOUT)
+        return {'success': True, 'request': {'id': row[0], 'adopter_name': row[1], 'pet_name': row[2], 'applied_at': row[3], 'status': row[4]}}
+    except concurrent.futures.TimeoutError:
+        return {'success': False, 'message': 'Timed out waiting for the database'}
     except Exception as e:
         return {'success': False, 'message': str(e)}
 
-def handle_compatibility_check(data):
-    pet_id = data.get('pet_id')
-    has_yard = data.get('has_yard') == 'yes'
-    has_children = data.get('has_children') == 'yes'
-    has_other_pets = data.get('has_other_pets') == 'yes'
-    experience_level = data.get('experience_level')
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT species, activity_level, age_months FROM animals WHERE id = ?', (pet_id,))
-    pet = cursor.fetchone()
-    conn.close()
-    if not pet:
-        return {'success': False, 'message': 'Pet not found'}
-    species, activity_level, age_months = pet
+# Compatibility scoring - every input combination is scored once at import
+def _score_compatibility(species, activity_level, is_young, has_yard, has_children, has_other_pets, experience_level):
     score = 100
     reasons = []
     if activity_level == 'High' and not has_yard:
@@ -246,7 +578,7 @@ def handle_compatibility_check(data):
     elif experience_level == 'Experienced':
         score += 10
         reasons.append("Your experience is perfect for any pet")
-    if has_children and age_months < 12:
+    if has_children and is_young:
         score -= 10
         reasons.append("Young pets may need extra supervision around children")
     elif has_children:
@@ -266,7 +598,69 @@ def handle_compatibility_check(data):
         message = "Fair match. Consider the factors below carefully."
     else:
         message = "This pet may not be the best fit, but adoption is always possible with proper preparation."
-    return {'success': True, 'compatibility_percentage': score, 'message': message, 'reasons': reasons}
+    return score, message, tuple(reasons)
+
+_BOOLS = (False, True)
+_COMPAT_TABLE = types.MappingProxyType({
+    key: _score_compatibility(*key)
+    for key in itertools.product(('Dog', 'Cat'), ('Low', 'Medium', 'High'), _BOOLS, _BOOLS, _BOOLS, _BOOLS,
+                                 ('Beginner', 'Intermediate', 'Experienced'))
+})
+
+@functools.lru_cache(maxsize=1024)
+def _get_pet_traits(pet_id):
+    """Species, activity level and age of a pet (cleared whenever pets are added)"""
+    return get_conn().execute(SQL_GET_PET_TRAITS, (pet_id,)).fetchone()
+
+def _adopter_profile(data):
+    """Normalise the adopter questionnaire into the table's key fields"""
+    experience_level = data.get('experience_level')
+    # Only the Beginner/Experienced levels change the score, so fold the rest
+    if experience_level not in ('Beginner', 'Experienced'):
+        experience_level = 'Intermediate'
+    return data.get('has_yard') == 'yes', data.get('has_children') == 'yes', data.get('has_other_pets') == 'yes', experience_level
+
+def _lookup_compatibility(species, activity_level, age_months, profile):
+    return _COMPAT_TABLE[('Dog' if species == 'Dog' else 'Cat', activity_level, age_months < 12) + profile]
+
+@functools.lru_cache(maxsize=4096)
+def _compat_result(pet_id, profile):
+    """Score one pet against a normalised profile (cleared whenever pets are added)"""
+    pet = _get_pet_traits(pet_id)
+    return _lookup_compatibility(*pet, profile) if pet else None
+
+def handle_compatibility_check(data):
+    try:
+        pet_id = int(data.get('pet_id'))
+    except (TypeError, ValueError, OverflowError):
+        return {'success': False, 'message': 'Pet not found'}
+    try:
+        result = _compat_result(pet_id, _adopter_profile(data))
+    except Exception as e:
+        return {'success': False, 'message': str(e)}
+    if not result:
+        return {'success': False, 'message': 'Pet not found'}
+    score, message, reasons = result
+    return {'success': True, 'compatibility_percentage': score, 'message': message, 'reasons': list(reasons)}
+
+def handle_bootstrap(data):
+    """Log in and return everything the dashboard needs in one response"""
+    response = handle_login(data)
+    if response['success']:
+        response['pets'] = get_pets()
+        if response['user']['user_type'] == 'admin':
+            response['requests'] = handle_get_requests().get('requests', [])
+    return response
+
+def handle_rank_pets(data):
+    """Score every pet against one adopter profile in a single pass, best match first"""
+    profile = _adopter_profile(data)
+    rankings = []
+    for pet in get_pets():
+        score, message, reasons = _lookup_compatibility(pet['species'], pet['activity_level'], pet['age_months'], profile)
+        rankings.append({'pet_id': pet['id'], 'compatibility_percentage': score, 'message': message, 'reasons': list(reasons)})
+    rankings.sort(key=lambda r: r['compatibility_percentage'], reverse=True)
+    return {'success': True, 'rankings': rankings}
 
 # Embedded HTML Frontend
 HTML = """<!DOCTYPE html>
@@ -414,8 +808,8 @@ body{font-family:'Segoe UI',sans-serif;background:linear-gradient(135deg,#667eea
 <h5>Filter Pets</h5>
 <div class="row g-3">
 <div class="col-md-2"><label>Species</label><select class="form-select" id="filterSpecies" onchange="applyFilters()"><option value="">All</option><option value="Dog">Dog</option><option value="Cat">Cat</option></select></div>
-<div class="col-md-2"><label>Breed</label><input type="text" class="form-control" id="filterBreed" onkeyup="applyFilters()" placeholder="Any"></div>
-<div class="col-md-2"><label>Color</label><input type="text" class="form-control" id="filterColor" onkeyup="applyFilters()" placeholder="Any"></div>
+<div class="col-md-2"><label>Breed</label><input type="text" class="form-control" id="filterBreed" oninput="applyFiltersDebounced()" placeholder="Any"></div>
+<div class="col-md-2"><label>Color</label><input type="text" class="form-control" id="filterColor" oninput="applyFiltersDebounced()" placeholder="Any"></div>
 <div class="col-md-2"><label>Min Age</label><input type="number" class="form-control" id="filterMinAge" onchange="applyFilters()" placeholder="0" min="0"></div>
 <div class="col-md-2"><label>Max Age</label><input type="number" class="form-control" id="filterMaxAge" onchange="applyFilters()" placeholder="999" min="1"></div>
 <div class="col-md-2"><label>Gender</label><select class="form-select" id="filterGender" onchange="applyFilters()"><option value="">All</option><option value="Male">Male</option><option value="Female">Female</option></select></div>
@@ -497,6 +891,25 @@ body{font-family:'Segoe UI',sans-serif;background:linear-gradient(135deg,#667eea
 </div>
 </div>
 
+<template id="petCardTpl">
+<div class="col-md-3">
+<div class="pet-card">
+<img class="pet-card-img" data-role="img" loading="lazy" decoding="async" width="200" height="200"
+     onerror="this.src='https://images.unsplash.com/photo-1560743641-3914f2c45636?w=200'">
+<div class="pet-card-body">
+<div data-role="name" style="font-size:1.5rem;font-weight:bold"></div>
+<div class="mb-2">
+<span class="badge bg-primary" data-role="species"></span>
+<span class="badge bg-info" data-role="breed"></span>
+</div>
+<div class="mb-2"><small data-role="meta"></small></div>
+<button class="btn btn-sm btn-primary-custom w-100 mb-2" data-action="detail">View Details</button>
+<button class="btn btn-sm btn-success w-100" data-action="adopt">Adopt</button>
+</div>
+</div>
+</div>
+</template>
+
 <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
 <script>
 let currentUser = null;
@@ -575,7 +988,7 @@ document.getElementById('adminLoginForm').addEventListener('submit', async funct
     
     console.log('Admin login attempt:', username);
     
-    const response = await fetch('/api/login', {
+    const response = await fetch('/api/bootstrap', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ username, password, user_type: 'admin' })
@@ -588,7 +1001,8 @@ document.getElementById('adminLoginForm').addEventListener('submit', async funct
         currentUser = data.user;
         hideAll();
         document.getElementById('adminDashboard').classList.remove('hidden');
-        loadPets('admin');
+        setPets(data.pets, 'admin');
+        renderRequests(data.requests);
     } else {
         alert(data.message || 'Login failed');
     }
@@ -601,7 +1015,7 @@ document.getElementById('adopterSignInForm').addEventListener('submit', async fu
     
     console.log('Adopter login attempt:', username);
     
-    const response = await fetch('/api/login', {
+    const response = await fetch('/api/bootstrap', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ username, password, user_type: 'adopter' })
@@ -614,10 +1028,7 @@ document.getElementById('adopterSignInForm').addEventListener('submit', async fu
         currentUser = data.user;
         hideAll();
         document.getElementById('adopterDashboard').classList.remove('hidden');
-        // Small delay to ensure DOM is ready
-        setTimeout(() => {
-            loadPets('adopter');
-        }, 100);
+        setPets(data.pets, 'adopter');
     } else {
         alert(data.message || 'Login failed');
     }
@@ -685,10 +1096,7 @@ async function loadPets(type) {
         console.log('Pets data received:', data);
         
         if (data.success) {
-            allPets = data.pets || [];
-            filteredPets = [...allPets];
-            console.log(`Loaded ${allPets.length} pets`);
-            displayPets(type);
+            setPets(data.pets, type);
         } else {
             console.error('Failed to load pets:', data.message);
             alert('Failed to load pets: ' + (data.message || 'Unknown error'));
@@ -699,6 +1107,42 @@ async function loadPets(type) {
     }
 }
 
+function setPets(pets, type) {
+    allPets = pets || [];
+    filteredPets = [...allPets];
+    console.log(`Loaded ${allPets.length} pets`);
+    displayPets(type);
+}
+
+// Cards show a 200px Unsplash rendition; the detail modal keeps the full-size photo
+function thumbUrl(url) {
+    try {
+        const u = new URL(url, location.href);
+        if (u.hostname !== 'images.unsplash.com') return url;
+        u.searchParams.set('w', '200');
+        return u.toString();
+    } catch (e) {
+        return url;
+    }
+}
+
+const petCardTpl = document.getElementById('petCardTpl').content.firstElementChild;
+
+// Clone the parsed card template and fill its slots; text goes in via textContent, never markup
+function petCardNode(pet, isAdopter) {
+    const node = petCardTpl.cloneNode(true);
+    node.dataset.petId = pet.id;
+    const img = node.querySelector('[data-role=img]');
+    img.src = thumbUrl(pet.profile_photo_url);
+    img.alt = pet.name;
+    node.querySelector('[data-role=name]').textContent = pet.name;
+    node.querySelector('[data-role=species]').textContent = pet.species;
+    node.querySelector('[data-role=breed]').textContent = pet.breed;
+    node.querySelector('[data-role=meta]').textContent = `${pet.age_months} months | ${pet.gender}`;
+    if (!isAdopter) node.querySelector('[data-action=adopt]').remove();
+    return node;
+}
+
 function displayPets(type) {
     console.log('Displaying pets for:', type, 'Count:', filteredPets.length);
     
@@ -711,8 +1155,6 @@ function displayPets(type) {
         return;
     }
     
-    grid.innerHTML = '';
-    
     if (filteredPets.length === 0) {
         grid.innerHTML = `
             <div class="col-12 text-center">
@@ -724,56 +1166,33 @@ function displayPets(type) {
         return;
     }
     
-    filteredPets.forEach(pet => {
-        // Create a safe version of the pet object for onclick
-        const safePet = {
-            id: pet.id,
-            name: pet.name,
-            species: pet.species,
-            breed: pet.breed,
-            color: pet.color,
-            age_months: pet.age_months,
-            gender: pet.gender,
-            vaccinated: pet.vaccinated,
-            activity_level: pet.activity_level,
-            weight_kg: pet.weight_kg,
-            description: pet.description,
-            profile_photo_url: pet.profile_photo_url
-        };
-        
-        const cardHtml = `
-            <div class="col-md-3">
-                <div class="pet-card">
-                    <img src="${pet.profile_photo_url}" class="pet-card-img" alt="${pet.name}" 
-                         onerror="this.src='https://images.unsplash.com/photo-1560743641-3914f2c45636?w=400'">
-                    <div class="pet-card-body">
-                        <div style="font-size:1.5rem;font-weight:bold">${pet.name}</div>
-                        <div class="mb-2">
-                            <span class="badge bg-primary">${pet.species}</span> 
-                            <span class="badge bg-info">${pet.breed}</span>
-                        </div>
-                        <div class="mb-2">
-                            <small>${pet.age_months} months | ${pet.gender}</small>
-                        </div>
-                        <button class="btn btn-sm btn-primary-custom w-100 mb-2" 
-                                onclick="showPetDetail(${JSON.stringify(safePet).replace(/"/g, '&quot;')})">
-                            View Details
-                        </button>
-                        ${type === 'adopter' ? `
-                            <button class="btn btn-sm btn-success w-100" 
-                                    onclick="adoptPet(${pet.id}, '${pet.name.replace(/'/g, "\\'")}')">
-                                Adopt
-                            </button>
-                        ` : ''}
-                    </div>
-                </div>
-            </div>`;
-        grid.innerHTML += cardHtml;
-    });
+    // Build every card off-document and swap them in with a single insertion
+    const isAdopter = type === 'adopter';
+    const frag = document.createDocumentFragment();
+    for (const pet of filteredPets) {
+        frag.appendChild(petCardNode(pet, isAdopter));
+    }
+    grid.replaceChildren(frag);
     
     console.log('Pets displayed successfully');
 }
 
+// One delegated click handler per grid instead of an inline onclick per card
+function handlePetGridClick(e) {
+    const button = e.target.closest('[data-action]');
+    if (!button) return;
+    const petId = Number(button.closest('[data-pet-id]').dataset.petId);
+    const pet = filteredPets.find(p => p.id === petId) || allPets.find(p => p.id === petId);
+    if (!pet) return;
+    if (button.dataset.action === 'detail') {
+        showPetDetail(pet);
+    } else if (button.dataset.action === 'adopt') {
+        adoptPet(pet.id, pet.name);
+    }
+}
+document.getElementById('adminPetGrid').addEventListener('click', handlePetGridClick);
+document.getElementById('adopterPetGrid').addEventListener('click', handlePetGridClick);
+
 function showPetDetail(pet) {
     console.log('Showing pet details:', pet.name);
     
@@ -832,17 +1251,20 @@ function checkCompatibility(petId) {
     console.log('Checking compatibility for pet ID:', petId);
     currentPetForCompatibility = petId;
     
-    // Close pet detail modal first
-    if (petDetailModal) {
-        petDetailModal.hide();
+    swapModal('petDetailModal', petDetailModal, compatibilityModal);
+}
+
+// Show `next` as soon as `current` has finished hiding (Bootstrap modals can't overlap)
+function swapModal(currentId, current, next) {
+    const element = document.getElementById(currentId);
+    if (!current || !element.classList.contains('show')) {
+        if (next) next.show();
+        return;
     }
-    
-    // Show compatibility modal after a short delay
-    setTimeout(() => {
-        if (compatibilityModal) {
-            compatibilityModal.show();
-        }
-    }, 300);
+    element.addEventListener('hidden.bs.modal', () => {
+        if (next) next.show();
+    }, { once: true });
+    current.hide();
 }
 
 document.getElementById('compatibilityForm').addEventListener('submit', async function(e) {
@@ -879,15 +1301,7 @@ document.getElementById('compatibilityForm').addEventListener('submit', async fu
             </ul>
         `;
         
-        if (compatibilityModal) {
-            compatibilityModal.hide();
-        }
-        
-        setTimeout(() => {
-            if (compatibilityResultModal) {
-                compatibilityResultModal.show();
-            }
-        }, 300);
+        swapModal('compatibilityModal', compatibilityModal, compatibilityResultModal);
     } else {
         alert(result.message || 'Compatibility check failed');
     }
@@ -932,24 +1346,23 @@ async function adoptPet(petId, petName) {
 async function loadRequests() {
     console.log('Loading adoption requests');
     
-    const response = await fetch('/api/requests', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: '{}'
-    });
+    const response = await fetch('/api/requests');
     
     const data = await response.json();
     console.log('Requests data:', data);
     
+    renderRequests(data.success ? data.requests : []);
+}
+
+function renderRequests(requests) {
     const tableBody = document.getElementById('requestsTableBody');
-    tableBody.innerHTML = '';
     
-    if (data.success && data.requests.length > 0) {
-        data.requests.forEach(request => {
+    if (requests && requests.length > 0) {
+        tableBody.innerHTML = requests.map(request => {
             const statusClass = request.status === 'approved' ? 'bg-success' : 
                               request.status === 'rejected' ? 'bg-danger' : 'bg-warning';
             
-            tableBody.innerHTML += `
+            return `
                 <tr>
                     <td>${request.id}</td>
                     <td>${request.adopter_name}</td>
@@ -958,7 +1371,7 @@ async function loadRequests() {
                     <td><span class="badge ${statusClass}">${request.status}</span></td>
                 </tr>
             `;
-        });
+        }).join('');
     } else {
         tableBody.innerHTML = `
             <tr>
@@ -971,31 +1384,52 @@ async function loadRequests() {
 }
 
 // Filter functions
-function applyFilters() {
-    const speciesFilter = document.getElementById('filterSpecies').value;
-    const breedFilter = document.getElementById('filterBreed').value.toLowerCase();
-    const colorFilter = document.getElementById('filterColor').value.toLowerCase();
-    const minAge = parseInt(document.getElementById('filterMinAge').value) || 0;
-    const maxAge = parseInt(document.getElementById('filterMaxAge').value) || 999;
-    const genderFilter = document.getElementById('filterGender').value;
-    const vaccinatedFilter = document.getElementById('filterVaccinated').value;
-    const activityFilter = document.getElementById('filterActivity').value;
-    
-    console.log('Applying filters:', {
-        speciesFilter, breedFilter, colorFilter, minAge, maxAge, 
-        genderFilter, vaccinatedFilter, activityFilter
+let filterSeq = 0;
+
+const debounce = (fn, ms) => {
+    let timer;
+    return (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn(...args), ms);
+    };
+};
+// Text inputs filter once typing pauses; selects still call applyFilters directly
+const applyFiltersDebounced = debounce(applyFilters, 150);
+
+async function applyFilters() {
+    const filters = {
+        species: document.getElementById('filterSpecies').value,
+        breed: document.getElementById('filterBreed').value.trim(),
+        color: document.getElementById('filterColor').value.trim(),
+        min_age: document.getElementById('filterMinAge').value,
+        max_age: document.getElementById('filterMaxAge').value,
+        gender: document.getElementById('filterGender').value,
+        vaccinated: document.getElementById('filterVaccinated').value,
+        activity_level: document.getElementById('filterActivity').value
+    };
+    Object.keys(filters).forEach(key => {
+        if (filters[key] === '') delete filters[key];
     });
     
-    filteredPets = allPets.filter(pet => {
-        return (!speciesFilter || pet.species === speciesFilter) &&
-               (!breedFilter || pet.breed.toLowerCase().includes(breedFilter)) &&
-               (!colorFilter || pet.color.toLowerCase().includes(colorFilter)) &&
-               (pet.age_months >= minAge) &&
-               (pet.age_months <= maxAge) &&
-               (!genderFilter || pet.gender === genderFilter) &&
-               (!vaccinatedFilter || pet.vaccinated.toString() === vaccinatedFilter) &&
-               (!activityFilter || pet.activity_level === activityFilter);
-    });
+    console.log('Applying filters:', filters);
+    
+    // Filtering runs server-side; ignore responses overtaken by a newer request
+    const seq = ++filterSeq;
+    try {
+        const response = await fetch('/api/pets?' + new URLSearchParams(filters));
+        const data = await response.json();
+        if (seq !== filterSeq) return;
+        
+        if (data.success) {
+            filteredPets = data.pets;
+        } else {
+            console.error('Failed to filter pets:', data.message);
+            filteredPets = [];
+        }
+    } catch (error) {
+        console.error('Error filtering pets:', error);
+        return;
+    }
     
     console.log('Pets after filtering:', filteredPets.length);
     displayPets('adopter');
@@ -1003,6 +1437,7 @@ function applyFilters() {
 
 function clearFilters() {
     console.log('Clearing all filters');
+    filterSeq++;
     
     document.getElementById('filterSpecies').value = '';
     document.getElementById('filterBreed').value = '';
@@ -1024,33 +1459,108 @@ console.log('Smart Pet Adoption Shelter initialized');
 </html>
 """
 
+# Encode, minify and compress the frontend once instead of on every request.
+# Indentation between tags is folded to a single newline, which renders the
+# same and keeps line breaks (and so JS semantics) inside the inline script.
+_WS_BETWEEN_TAGS = re.compile(rb'>\s*\n\s*<')
+HTML_BYTES = _WS_BETWEEN_TAGS.sub(b'>\n<', HTML.encode('utf-8'))
+HTML_GZIP = gzip.compress(HTML_BYTES, compresslevel=9)
+
+# HTTP Server
+class PetAdoptionServer(ThreadingHTTPServer):
+    request_queue_size = 128  # room for the burst of parallel fetches after sign-in
+
 # HTTP Request Handler
 class PetAdoptionHandler(BaseHTTPRequestHandler):
+    # Keep-alive: every response below must carry a Content-Length
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # TCP_NODELAY on every accepted connection
+    timeout = 30  # drop idle keep-alive sockets instead of parking a thread on them forever
+    
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        finally:
+            release_conn()  # idle keep-alive sockets must not hold a connection
+    
     def do_GET(self):
-        if self.path == '/' or self.path == '/index.html':
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == '/' or url.path == '/index.html':
+            use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+            body = HTML_GZIP if use_gzip else HTML_BYTES
             self.send_response(200)
-            self.send_header('Content-type', 'text/html')
+            self.send_header('Content-type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'public, max-age=3600')
+            self.send_header('Vary', 'Accept-Encoding')
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
             self.end_headers()
-            self.wfile.write(HTML.encode('utf-8'))
-        elif self.path == '/api/pets':
-            response = handle_get_pets()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.wfile.write(body)
+        elif url.path == '/api/pets':
+            filters = {name: values[0] for name, values in urllib.parse.parse_qs(url.query).items()}
+            limit = filters.pop('limit', None)
+            offset = filters.pop('offset', 0)
+            payload, etag = handle_get_pets(filters, limit, offset)
+            self.send_json(payload, etag, 'no-cache')
+        elif url.path == '/api/requests':
+            payload, etag = get_requests_payload()
+            self.send_json(payload, etag, 'private, max-age=0')
+        elif url.path.startswith('/static/'):
+            self.send_static(url.path[len('/static/'):])
         else:
-            self.send_response(404)
+            self.send_not_found()
+    
+    def send_json(self, payload, etag=None, cache_control=None):
+        """Send encoded JSON; tagged payloads answer a matching If-None-Match with 304"""
+        if etag and etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+            self.send_response(304)
+            self.send_header('ETag', etag)
             self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def send_not_found(self):
+        self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def send_static(self, name):
+        root = os.path.realpath(STATIC_DIR)
+        try:
+            path = os.path.realpath(os.path.join(root, urllib.parse.unquote(name)))
+            if not path.startswith(root + os.sep) or not os.path.isfile(path):
+                raise FileNotFoundError(name)
+            with open(path, 'rb') as f:
+                body = f.read()
+        except (ValueError, OSError):  # embedded null bytes, missing or unreadable files
+            self.send_not_found()
+            return
+        self.send_response(200)
+        self.send_header('Content-type', mimetypes.guess_type(path)[0] or 'application/octet-stream')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        self.end_headers()
+        self.wfile.write(body)
     
     def do_POST(self):
         content_length = int(self.headers['Content-Length'])
         post_data = self.rfile.read(content_length)
-        data = json.loads(post_data.decode('utf-8'))
+        data = _loads(post_data)
         
         response = {}
         
         if self.path == '/api/login':
             response = handle_login(data)
+        elif self.path == '/api/bootstrap':
+            response = handle_bootstrap(data)
         elif self.path == '/api/register':
             response = handle_register(data)
         elif self.path == '/api/pets':
@@ -1061,13 +1571,12 @@ class PetAdoptionHandler(BaseHTTPRequestHandler):
             response = handle_adopt_pet(data)
         elif self.path == '/api/ai/match':
             response = handle_compatibility_check(data)
+        elif self.path == '/api/ai/rank':
+            response = handle_rank_pets(data)
         else:
             response = {'success': False, 'message': 'Unknown endpoint'}
         
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(response).encode('utf-8'))
+        self.send_json(_dumps(response))
     
     def log_message(self, format, *args):
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {format % args}")
@@ -1075,9 +1584,13 @@ class PetAdoptionHandler(BaseHTTPRequestHandler):
 # Main execution
 if __name__ == '__main__':
     init_database()
+    if '--cache-photos' in sys.argv:
+        cache_pet_photos()
     
     PORT = 8000
-    server = HTTPServer(('localhost', PORT), PetAdoptionHandler)
+    # One thread per connection; each request borrows a pooled SQLite connection
+    # and all adoption writes go through the single writer thread
+    server = PetAdoptionServer(('localhost', PORT), PetAdoptionHandler)
     
     print(f"\n🎉 Smart Pet Adoption Shelter Started Successfully!")
     print(f"📍 Server running at: http://localhost:{PORT}")